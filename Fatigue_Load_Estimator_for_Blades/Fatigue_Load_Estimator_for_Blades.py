@@ -1,45 +1,133 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+try:
+    from numba import njit
+except ImportError:
+    print("Numba is required for the compiled rainflow kernel. Install it using: pip install numba")
+    raise
+
 # Material constants for S-N curve (simplified for wind turbine blade composite)
 m = 10.0  # S-N curve slope
 S_ref = 50e6  # Reference stress amplitude in Pa (50 MPa)
 N_ref = 1e6   # Cycles to failure at S_ref
 C = N_ref * S_ref ** m  # S-N constant (N = C / S^m)
 
+def turning_points(data):
+    """
+    Extract turning points (peaks and valleys) of a load time series, keeping both end points.
+    A sample is a turning point where the sign of the slope changes on either side of it.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) < 3:
+        return data.copy()
+    sign = np.sign(np.diff(data))
+    tp_mask = np.empty(len(data), dtype=bool)
+    tp_mask[0] = tp_mask[-1] = True
+    tp_mask[1:-1] = sign[:-1] != sign[1:]
+    return data[tp_mask]
+
+@njit(cache=True, fastmath=True)
+def _rainflow_numba(tp, amps_out, counts_out):
+    """
+    Compiled rainflow kernel over a sequence of turning points. Writes cycle amplitudes and
+    counts into the preallocated output arrays (length >= len(tp)) and returns the number
+    of cycles written.
+    The first call pays the JIT compile cost (cached to disk via cache=True, so later
+    runs skip it); subsequent calls with the same argument types run as native code.
+    """
+    n = tp.shape[0]
+    # Points ahead of the 3-point window are never revisited, so the surviving points are
+    # kept on a preallocated stack (top = its size) instead of pop(i + 1) on a list
+    stack = np.empty(n, dtype=np.float64)
+    top = min(n, 2)
+    stack[:top] = tp[:top]
+    k = 0
+    for r in range(2, n):
+        r1 = abs(stack[top - 1] - stack[top - 2])
+        r2 = abs(tp[r] - stack[top - 1])
+        if r1 <= r2:
+            amps_out[k] = r1 / 2  # Amplitude and full cycle count
+            counts_out[k] = 1.0
+            k += 1
+            top -= 1
+        stack[top] = tp[r]
+        top += 1
+    
+    # Remaining residue as half cycle
+    if top >= 2:
+        amps_out[k] = abs(stack[top - 1] - stack[top - 2]) / 2  # Amplitude and half cycle count
+        counts_out[k] = 0.5
+        k += 1
+    
+    return k
+
 def rainflow(data):
     """
     Simplified rainflow counting algorithm to extract cycles from load time series.
-    Returns list of (amplitude, count) where count is 1 for full cycles, 0.5 for half cycles.
+    Returns arrays (amplitudes, counts) where count is 1 for full cycles, 0.5 for half cycles.
     """
-    # Extract turning points (peaks and valleys)
-    tp = []
-    for val in data:
-        while len(tp) >= 2 and (val - tp[-1]) * (tp[-1] - tp[-2]) <= 0:
-            tp.pop()
-        tp.append(val)
-    
-    # Rainflow cycle extraction
-    cycles = []
-    i = 0
-    while len(tp) - i >= 3:
-        S0 = tp[i]
-        S1 = tp[i + 1]
-        S2 = tp[i + 2]
-        r1 = abs(S1 - S0)
-        r2 = abs(S2 - S1)
-        if r1 <= r2:
-            cycles.append((r1 / 2, 1.0))  # Amplitude and full cycle count
-            tp.pop(i + 1)
+    # Vectorized pre-filter: only the local extrema reach the stack kernel
+    tp = np.ascontiguousarray(turning_points(data))
+    # Each cycle consumes at least one turning point, so len(tp) bounds the cycle count
+    amps = np.empty(len(tp))
+    counts = np.empty(len(tp))
+    k = _rainflow_numba(tp, amps, counts)
+    return amps[:k], counts[:k]
+
+@njit(cache=True, fastmath=True)
+def _push_turning_point(stack, top, val, m, C):
+    """Push a turning point onto the rainflow stack; returns the new stack size and the damage of any closed cycle."""
+    damage = 0.0
+    if top >= 2:
+        r1 = abs(stack[top - 1] - stack[top - 2])
+        if r1 <= abs(val - stack[top - 1]):
+            amp = r1 / 2  # Full cycle
+            if amp > 0:
+                damage = amp ** m / C
+            top -= 1
+    stack[top] = val
+    return top + 1, damage
+
+@njit(cache=True, fastmath=True)
+def segment_damage(wind, m, C):
+    """
+    Fused stress, rainflow and Miner's rule kernel: streams a wind speed series to its fatigue damage
+    in a single pass, detecting turning points on the fly and accumulating count * amp^m / C as each
+    cycle closes, so neither the stress series nor a cycle list is ever materialized.
+    Gives the same result as turning_points + rainflow + the vectorized Miner's sum.
+    """
+    n = wind.shape[0]
+    stack = np.empty(n, dtype=np.float64)
+    top = 0
+    damage = 0.0
+    prev = 0.0
+    prev_sign = 0.0
+    for i in range(n):
+        # Simplified stress calculation (proportional to wind speed squared, scaled to MPa range)
+        s = 0.5e6 * wind[i] ** 2  # Results in stress amplitudes around 50e6 Pa for normal wind
+        if i == 0:
+            stack[0] = s
+            top = 1
         else:
-            i += 1
+            sign = np.sign(s - prev)
+            # Slope changes sign at the previous sample, so it is a peak or valley
+            if i >= 2 and sign != prev_sign:
+                top, d = _push_turning_point(stack, top, prev, m, C)
+                damage += d
+            prev_sign = sign
+        prev = s
+    if n >= 2:
+        top, d = _push_turning_point(stack, top, prev, m, C)
+        damage += d
     
-    # Remaining residues as half cycles
-    for j in range(i, len(tp) - 1):
-        r = abs(tp[j + 1] - tp[j])
-        cycles.append((r / 2, 0.5))  # Amplitude and half cycle count
+    # Remaining residue as half cycle
+    if top >= 2:
+        amp = abs(stack[top - 1] - stack[top - 2]) / 2
+        if amp > 0:
+            damage += 0.5 * amp ** m / C
     
-    return cycles
+    return damage
 
 # Define wind regimes (mean wind speed m/s, standard deviation for turbulence)
 wind_regimes = {
@@ -53,56 +141,51 @@ num_segments = 24  # Hours in a day
 points_per_segment = 1000  # Data points per hour
 segment_duration = 3600  # Seconds per segment (1 hour)
 
-for regime, (mean_wind, std_wind) in wind_regimes.items():
-    damage_accum = []
-    cum_damage = 0.0
+# Main execution (guarded so rainflow(), turning_points() and segment_damage() can be imported)
+if __name__ == "__main__":
+    rng = np.random.default_rng()
+    
+    # Time array and sinusoidal gust shape (period ~5 min) are the same for every segment
+    t = np.linspace(0, segment_duration, points_per_segment)
+    gust_shape = np.sin(2 * np.pi * t / 300)
     
-    for seg in range(num_segments):
-        # Slight hourly variation in mean wind
-        current_mean = mean_wind + np.random.normal(0, 0.5)
+    for regime, (mean_wind, std_wind) in wind_regimes.items():
+        damage_accum = []
+        cum_damage = 0.0
         
-        # Time array for the segment
-        t = np.linspace(0, segment_duration, points_per_segment)
+        # Draw the whole day's random inputs up front: slight hourly variation in mean wind and turbulence noise
+        current_means = mean_wind + rng.standard_normal(num_segments) * 0.5
+        noise = rng.standard_normal((num_segments, points_per_segment)) * (std_wind / 2)
+        gust = std_wind * gust_shape
         
-        # Simulate wind speed with sinusoidal gusts (period ~5 min) and noise
-        wind = current_mean + std_wind * np.sin(2 * np.pi * t / 300) + np.random.normal(0, std_wind / 2, points_per_segment)
+        for seg in range(num_segments):
+            # Simulate wind speed with sinusoidal gusts and noise
+            wind = current_means[seg] + gust + noise[seg]
         
-        # Simplified stress calculation (proportional to wind speed squared, scaled to MPa range)
-        stress = 0.5e6 * wind ** 2  # Results in stress amplitudes around 50e6 Pa for normal wind
+            # Stress, rainflow counting and Miner's rule damage (count / N with N = C / amp^m) in one kernel
+            cum_damage += segment_damage(wind, m, C)
+            damage_accum.append(cum_damage)
         
-        # Apply rainflow counting
-        cycles = rainflow(stress)
+        # Plot damage accumulation for this regime
+        times = np.arange(1, num_segments + 1)
+        plt.plot(times, damage_accum, label=regime)
         
-        # Compute damage for the segment using Miner's rule
-        segment_damage = 0.0
-        for amp, count in cycles:
-            if amp > 0:
-                N = C / amp ** m
-                segment_damage += count / N
+        # Estimate fatigue life (assuming this simulation represents one typical day)
+        daily_damage = cum_damage
+        if daily_damage > 0:
+            life_days = 1.0 / daily_damage
+            life_years = life_days / 365.25
+        else:
+            life_years = float('inf')
         
-        cum_damage += segment_damage
-        damage_accum.append(cum_damage)
+        print(f"{regime} regime:")
+        print(f"  Daily damage: {daily_damage:.2e}")
+        print(f"  Estimated fatigue life: {life_years:.2f} years\n")
     
-    # Plot damage accumulation for this regime
-    times = np.arange(1, num_segments + 1)
-    plt.plot(times, damage_accum, label=regime)
-    
-    # Estimate fatigue life (assuming this simulation represents one typical day)
-    daily_damage = cum_damage
-    if daily_damage > 0:
-        life_days = 1.0 / daily_damage
-        life_years = life_days / 365.25
-    else:
-        life_years = float('inf')
-    
-    print(f"{regime} regime:")
-    print(f"  Daily damage: {daily_damage:.2e}")
-    print(f"  Estimated fatigue life: {life_years:.2f} years\n")
-
-# Final plot
-plt.xlabel('Time (hours)')
-plt.ylabel('Cumulative Fatigue Damage')
-plt.title('Fatigue Damage Accumulation Over One Day for Different Wind Regimes')
-plt.legend()
-plt.grid(True)
-plt.show()
\ No newline at end of file
+    # Final plot
+    plt.xlabel('Time (hours)')
+    plt.ylabel('Cumulative Fatigue Damage')
+    plt.title('Fatigue Damage Accumulation Over One Day for Different Wind Regimes')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
\ No newline at end of file
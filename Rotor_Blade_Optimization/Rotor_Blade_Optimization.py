@@ -11,7 +11,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+import os
 import random
+from collections import OrderedDict
+from multiprocessing import Pool
 from scipy.optimize import minimize
 
 try:
@@ -31,6 +34,7 @@ NORM_MASS = 5000.0
 NORM_FATIGUE = 100.0
 
 # Evaluation function (simplified models, tuned per papers: AEP ~ BEM proxy, mass ~ sectional, fatigue ~ root moment)
+# Pure NumPy arithmetic, so it works on a single individual or on stacked gene arrays (see evaluate_batch)
 def evaluate(individual):
     length, chord, twist = individual
     # Annual Energy Production (MWh, maximize): Polynomial proxy for BEM, increases with length^2 and chord, modulated by twist
@@ -38,9 +42,49 @@ def evaluate(individual):
     # Blade Mass (kg, minimize): Proportional to length * avg chord (proxy for composite layup integration)
     mass = 40.0 * length * chord  # Reduced coeff to align with lit (e.g., ~20-30 ton blades)
     # Fatigue Load (arbitrary units, minimize): Proxy for DEL/root bending ~ length^3 / chord
-    fatigue = 0.005 * length**3 / max(chord, 0.1)  # Tuned; in lit, often constrained via freq/stress
+    fatigue = 0.005 * length**3 / np.maximum(chord, 0.1)  # Tuned; in lit, often constrained via freq/stress
     return AEP, mass, fatigue
 
+# Closed-form Jacobian of evaluate: rows (AEP, mass, fatigue), columns (length, chord, twist)
+def evaluate_jacobian(individual):
+    length, chord, twist = individual
+    chord_term = 1 + 0.15 * chord
+    twist_term = 1 + 0.08 * twist / 20.0
+    dAEP = [0.1 * length * chord_term * twist_term,
+            0.05 * length**2 * 0.15 * twist_term,
+            0.05 * length**2 * chord_term * 0.08 / 20.0]
+    dmass = [40.0 * chord, 40.0 * length, 0.0]
+    if chord > 0.1:
+        dfatigue = [0.015 * length**2 / chord, -0.005 * length**3 / chord**2, 0.0]
+    else:  # Chord clamped at 0.1 in evaluate
+        dfatigue = [0.015 * length**2 / 0.1, 0.0, 0.0]
+    return np.array([dAEP, dmass, dfatigue])
+
+def evaluate_batch(population):
+    # Evaluate an (N, 3) stack of individuals in one vectorized call; returns an (N, 3) array of objectives
+    X = np.asarray(population, dtype=float)
+    return np.column_stack(evaluate(X.T))
+
+# LRU cache for GA fitness evaluations: NSGA-II selection keeps reintroducing near-duplicate individuals
+# Used only by batched_map; it quantizes genes to 1e-3, so never use it where exact objective values matter
+FITNESS_CACHE_SIZE = 4096
+_fitness_cache = OrderedDict()
+
+def fitness_key(individual):
+    # Quantize genes to 3 decimals (ample resolution for bound widths of 30 m / 4 m / 20 deg)
+    return tuple(round(x, 3) for x in individual)
+
+def lookup_fitness(key):
+    values = _fitness_cache.get(key)
+    if values is not None:
+        _fitness_cache.move_to_end(key)
+    return values
+
+def store_fitness(key, values):
+    _fitness_cache[key] = values
+    if len(_fitness_cache) > FITNESS_CACHE_SIZE:
+        _fitness_cache.popitem(last=False)  # Evict least recently used
+
 # Part 1: Genetic Algorithm (Exploration) using DEAP for multi-objective (NSGA-II)
 creator.create("FitnessMulti", base.Fitness, weights=(1.0, -1.0, -1.0))  # Max AEP, Min mass, Min fatigue
 creator.create("Individual", list, fitness=creator.FitnessMulti)
@@ -53,6 +97,38 @@ toolbox.register("individual", tools.initCycle, creator.Individual,
                  (toolbox.attr_length, toolbox.attr_chord, toolbox.attr_twist), n=1)
 toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 toolbox.register("evaluate", evaluate)
+toolbox.register("evaluate_batch", evaluate_batch)  # Batch form of evaluate; re-register (or unregister) both together
+
+# Drop-in for toolbox.map: fitness evaluation goes through the LRU cache, and all misses of a generation are
+# scored by toolbox.evaluate_batch in one call (one call per worker with a multiprocessing pool).
+# Without a registered batch evaluator the misses are scored one by one with toolbox.evaluate.
+def batched_map(func, population, pool=None):
+    if func is not toolbox.evaluate:
+        return list(map(func, population))
+    fitnesses = [None] * len(population)
+    misses = []
+    for i, ind in enumerate(population):
+        fitnesses[i] = lookup_fitness(fitness_key(ind))
+        if fitnesses[i] is None:
+            misses.append(i)
+    if misses:
+        batch_func = getattr(toolbox, "evaluate_batch", None)
+        if batch_func is None:
+            individuals = [population[i] for i in misses]
+            batch = list(map(func, individuals)) if pool is None else pool.map(func, individuals)
+            batch = np.asarray(batch, dtype=float)
+        else:
+            X = np.asarray([population[i] for i in misses], dtype=float)
+            if pool is None:
+                batch = batch_func(X)
+            else:
+                batch = np.concatenate(pool.map(batch_func, np.array_split(X, os.cpu_count() or 1)))
+        for i, row in zip(misses, batch):
+            fitnesses[i] = tuple(row.tolist())
+            store_fitness(fitness_key(population[i]), fitnesses[i])
+    return fitnesses
+
+toolbox.register("map", batched_map)
 toolbox.register("mate", tools.cxSimulatedBinaryBounded, low=LOW, up=UP, eta=20.0)
 toolbox.register("mutate", tools.mutPolynomialBounded, low=LOW, up=UP, eta=20.0, indpb=1.0/NDIM)
 toolbox.register("select", tools.selNSGA2)
@@ -72,6 +148,14 @@ def run_ga():
 
 # Part 2: Gradient-based (Exploitation) using SciPy with normalized weighted sum
 # Generates Pareto points by varying normalized weights (w1 for -AEP, w2 for mass, w3 for fatigue; sum w=1)
+# Normalized weighted sum: min w_aep*(-AEP/norm) + w_mass*(mass/norm) + w_fatigue*(fatigue/norm),
+# with the signs and norms folded into w_scaled once per weight vector
+def obj_weighted(x, w_scaled):
+    return w_scaled @ np.array(evaluate(x))
+
+def jac_weighted(x, w_scaled):
+    return w_scaled @ evaluate_jacobian(x)
+
 def run_gradient(num_points=10):
     pareto_points = []
     bounds = list(zip(LOW, UP))
@@ -81,12 +165,10 @@ def run_gradient(num_points=10):
     weights_list = np.random.dirichlet((1,1,1), num_points)  # [w_aep, w_mass, w_fatigue]
     
     for w in weights_list:
-        def obj_weighted(x):
-            AEP, mass, fatigue = evaluate(x)
-            # Normalized weighted sum: min w_aep*(-AEP/norm) + w_mass*(mass/norm) + w_fatigue*(fatigue/norm)
-            return w[0] * (-AEP / NORM_AEP) + w[1] * (mass / NORM_MASS) + w[2] * (fatigue / NORM_FATIGUE)
-        
-        res = minimize(obj_weighted, x0, bounds=bounds, method='SLSQP', tol=1e-6)
+        w_scaled = np.array([-w[0] / NORM_AEP, w[1] / NORM_MASS, w[2] / NORM_FATIGUE])
+        # Analytic gradient replaces SLSQP's finite-difference evaluations
+        res = minimize(obj_weighted, x0, args=(w_scaled,), jac=jac_weighted, bounds=bounds,
+                       method='SLSQP', tol=1e-6)
         if res.success:
             pareto_points.append(evaluate(res.x))
     
@@ -96,7 +178,10 @@ def run_gradient(num_points=10):
 if __name__ == "__main__":
     # Run Genetic Algorithm
     print("Running Genetic Algorithm (NSGA-II)...")
-    hof = run_ga()
+    with Pool() as pool:
+        toolbox.register("map", batched_map, pool=pool)  # Fitness evaluation spread across all cores
+        hof = run_ga()
+    toolbox.register("map", batched_map)
     
     # Extract Pareto front from GA
     ga_aeps = [ind.fitness.values[0] for ind in hof]
@@ -1,5 +1,6 @@
 import numpy as np
 from scipy.optimize import differential_evolution
+from scipy.spatial.distance import pdist
 import matplotlib.pyplot as plt
 
 # Parameters
@@ -14,62 +15,48 @@ min_dist = 5 * D  # Minimum turbine distance (m)
 N = 9  # Number of turbines
 wind_dir = 0.0  # Wind direction (radians, 0 = from positive x-axis)
 
-# Function to calculate effective wind speed at a turbine considering wakes
-def get_wind_speed_at_turbine(turbine_idx, positions):
-    pos_i = positions[turbine_idx]
-    deficit_sum = 0.0
-    wind_vec = np.array([np.cos(wind_dir), np.sin(wind_dir)])
+# Function to calculate effective wind speed at every turbine considering wakes
+# Takes turbine coordinates as separate contiguous x / y arrays (SoA)
+def compute_all_wind_speeds(xs, ys):
+    # Wind direction read at call time (as in plot_wake), in float32 so it does not upcast the objective arrays
+    cos_wd = np.float32(np.cos(wind_dir))
+    sin_wd = np.float32(np.sin(wind_dir))
+    R = D / 2.0
+    a = np.float32((1 - np.sqrt(1 - Ct)) / 2.0)
+    
+    # Pairwise offsets from upstream turbine j to turbine i (NxN)
+    dx = xs[:, None] - xs[None, :]
+    dy = ys[:, None] - ys[None, :]
+    proj = dx * cos_wd + dy * sin_wd  # Downstream projection
+    cross2 = dx * dx + dy * dy - proj * proj  # Squared cross-wind distance
+    wake_radius = R + k * proj
+    # Downstream and inside the wake (self pairs have proj = 0 and drop out)
+    in_wake = (proj > 0) & (cross2 < wake_radius * wake_radius)
     
-    for j in range(N):
-        if j == turbine_idx:
-            continue
-        pos_j = positions[j]
-        vec = pos_i - pos_j
-        proj = np.dot(vec, wind_vec)  # Downstream projection
-        if proj <= 0:
-            continue  # Upstream, no wake
-        dist = np.linalg.norm(vec)
-        cross_dist = np.linalg.norm(vec - proj * wind_vec)
-        R = D / 2.0
-        wake_radius = R + k * proj
-        if cross_dist >= wake_radius:
-            continue  # Outside wake
-        a = (1 - np.sqrt(1 - Ct)) / 2.0
-        deficit = 2 * a / (1 + k * proj / R) ** 2
-        deficit_sum += deficit ** 2  # Sum of squares for multiple wakes
+    deficit = np.zeros_like(proj)
+    deficit[in_wake] = 2 * a / (1 + k * proj[in_wake] / R) ** 2
+    deficit_sum = (deficit ** 2).sum(axis=1)  # Sum of squares for multiple wakes
     
     U_eff = U0 * (1 - np.sqrt(deficit_sum))
-    return max(U_eff, 0.0)
+    return np.maximum(U_eff, 0.0)
 
 # Objective function: total power (to maximize, return negative for minimization)
 def total_power(pos_flat):
-    positions = pos_flat.reshape(-1, 2)
-    P_total = 0.0
+    # Interleaved (x, y) pairs split into float32 coordinate vectors
+    xs = pos_flat[0::2].astype(np.float32, copy=False)
+    ys = pos_flat[1::2].astype(np.float32, copy=False)
     A = np.pi * (D / 2.0) ** 2
     
-    for i in range(N):
-        U = get_wind_speed_at_turbine(i, positions)
-        P = 0.5 * rho * A * Cp * U ** 3
-        P_total += P
+    U = compute_all_wind_speeds(xs, ys)
+    P_total = 0.5 * rho * A * Cp * np.sum(U ** 3, dtype=np.float64)
     
-    # Penalty for violating minimum distance
-    penalty = 0.0
-    for i in range(N):
-        for j in range(i + 1, N):
-            dist = np.linalg.norm(positions[i] - positions[j])
-            if dist < min_dist:
-                penalty += (min_dist - dist) ** 2
+    # Penalty for violating minimum distance (pairwise distances computed in C by pdist)
+    dist = pdist(pos_flat.reshape(-1, 2))
+    violation = np.maximum(min_dist - dist, 0.0)
+    penalty = np.sum(violation * violation)
     
     return - (P_total - 1e6 * penalty)  # Large penalty to enforce constraints
 
-# Optimization using differential evolution
-bounds = [(0, farm_size)] * (2 * N)
-result = differential_evolution(total_power, bounds, popsize=20, maxiter=100, workers=1)
-best_pos = result.x.reshape(-1, 2)
-best_power = -result.fun  # Convert back to positive power
-
-print(f"Optimized total power: {best_power / 1e6:.2f} MW")
-
 # Plot the optimized layout
 def plot_layout(positions):
     fig, ax = plt.subplots()
@@ -87,23 +74,22 @@ def plot_wake(positions):
     x = np.linspace(0, farm_size, 100)
     y = np.linspace(0, farm_size, 100)
     X, Y = np.meshgrid(x, y)
-    U_field = np.full_like(X, U0)
     wind_vec = np.array([np.cos(wind_dir), np.sin(wind_dir)])
+    R = D / 2.0
+    a = (1 - np.sqrt(1 - Ct)) / 2.0
     
-    for j in range(N):
-        pos_j = positions[j]
-        vec_x = X - pos_j[0]
-        vec_y = Y - pos_j[1]
-        proj = vec_x * wind_vec[0] + vec_y * wind_vec[1]
-        cross_dist = np.sqrt(vec_x**2 + vec_y**2 - proj**2)
-        mask = proj > 0
-        R = D / 2.0
-        wake_radius = R + k * proj
-        in_wake = (cross_dist < wake_radius) & mask
-        a = (1 - np.sqrt(1 - Ct)) / 2.0
-        deficit = np.zeros_like(X)
-        deficit[in_wake] = 2 * a / (1 + k * proj[in_wake] / R) ** 2
-        U_field[in_wake] -= U0 * deficit[in_wake]  # Approximate linear superposition
+    # Grid offsets from every turbine at once (N x 100 x 100)
+    vec_x = X[None] - positions[:, 0, None, None]
+    vec_y = Y[None] - positions[:, 1, None, None]
+    proj = vec_x * wind_vec[0] + vec_y * wind_vec[1]
+    cross_dist = np.sqrt(np.maximum(vec_x**2 + vec_y**2 - proj**2, 0.0))
+    wake_radius = R + k * proj
+    in_wake = (proj > 0) & (cross_dist < wake_radius)
+    deficit = np.zeros_like(proj)
+    deficit[in_wake] = 2 * a / (1 + k * proj[in_wake] / R) ** 2
+    
+    # Sum of squares for multiple wakes, consistent with the optimization objective
+    U_field = np.maximum(U0 * (1 - np.sqrt((deficit ** 2).sum(axis=0))), 0.0)
     
     fig, ax = plt.subplots()
     contour = ax.contourf(X, Y, U_field, levels=20, cmap='viridis')
@@ -116,6 +102,17 @@ def plot_wake(positions):
     plt.grid(True)
     plt.show()
 
-# Generate plots
-plot_layout(best_pos)
-plot_wake(best_pos)
\ No newline at end of file
+# Main execution (guarded so multiprocessing workers can re-import this module safely)
+if __name__ == "__main__":
+    # Optimization using differential evolution; population evaluated in parallel across all cores
+    bounds = [(0, farm_size)] * (2 * N)
+    result = differential_evolution(total_power, bounds, popsize=20, maxiter=100,
+                                    workers=-1, updating='deferred')
+    best_pos = result.x.reshape(-1, 2)
+    best_power = -result.fun  # Convert back to positive power
+    
+    print(f"Optimized total power: {best_power / 1e6:.2f} MW")
+    
+    # Generate plots
+    plot_layout(best_pos)
+    plot_wake(best_pos)
\ No newline at end of file
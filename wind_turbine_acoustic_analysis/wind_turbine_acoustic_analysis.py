@@ -1,5 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.special import logsumexp
+
+try:
+    from numba import njit
+except ImportError:
+    print("Numba is required for the compiled SPL kernel. Install it using: pip install numba")
+    raise
 
 # Constants
 C0 = 343.0  # speed of sound in m/s
@@ -7,7 +14,13 @@ NU = 1.5e-5  # kinematic viscosity in m^2/s
 R = 100.0  # observer distance in m
 L = 50.0  # blade span in m (assumed for a typical wind turbine blade)
 D_H = 1.0  # approximate directivity (simplified)
+LN10 = np.log(10.0)  # converts decibel sums to natural-log units
+
+# Frequency range (10 Hz to 10 kHz), shared by every spectrum estimate
+F = np.logspace(1, 4, 100)
+F.flags.writeable = False  # Returned by every estimate_spl call, so in-place edits must not corrupt it
 
+@njit(cache=True)
 def get_A(a):
     """Spectral shape function A (using A_min for high Re approximation)"""
     if a < 0.204:
@@ -17,6 +30,7 @@ def get_A(a):
     else:
         return -142.795 * a**3 + 103.656 * a**2 - 57.757 * a + 6.006
 
+@njit(cache=True)
 def get_K1(Re):
     """Approximate K1 as a piece-wise linear function of log10(Re) based on BPM model"""
     logRe = np.log10(Re)
@@ -29,6 +43,32 @@ def get_K1(Re):
     else:
         return -12.5
 
+@njit(cache=True, fastmath=True)
+def _estimate_spl_core(tip_speed, chord, wind_speed, f, c0, nu, r, span, d_h):
+    """
+    Compiled SPL spectrum kernel (see estimate_spl). get_A and get_K1 are compiled into it.
+    The physical constants are arguments rather than module globals, which Numba would freeze
+    at compile time (and cache=True across runs), so rebinding C0, NU, R, L or D_H takes effect.
+    The first call compiles (cached to disk via cache=True, so later runs skip it);
+    repeated calls in a parametric sweep run as native code.
+    """
+    # Effective velocity (relative speed at blade)
+    U = np.sqrt(tip_speed**2 + wind_speed**2)
+    Re = U * chord / nu
+    M = U / c0
+    # Displacement thickness (tripped, zero alpha)
+    delta_star = 0.0306 * Re**(-0.117) * chord
+    St1 = 0.02 * M**(-0.6)
+    K1 = get_K1(Re)
+    # SPL spectrum (simplified for zero alpha)
+    level = 10 * np.log10(delta_star * M**5 * span * d_h / r**2) + K1
+    SPL = np.empty(f.shape[0], dtype=np.float64)  # f may be read-only (see F)
+    for i in range(f.shape[0]):
+        St = f[i] * delta_star / U
+        a = abs(np.log10(St / St1))
+        SPL[i] = level + get_A(a)
+    return SPL
+
 def estimate_spl(tip_speed, chord, wind_speed):
     """
     Estimate the sound pressure level (SPL) spectrum and overall SPL using a simplified BPM model for airfoil self-noise.
@@ -42,24 +82,10 @@ def estimate_spl(tip_speed, chord, wind_speed):
     - SPL: SPL spectrum in dB
     - overall_SPL: overall SPL in dB
     """
-    # Effective velocity (relative speed at blade)
-    U = np.sqrt(tip_speed**2 + wind_speed**2)
-    Re = U * chord / NU
-    M = U / C0
-    # Displacement thickness (tripped, zero alpha)
-    delta_star = 0.0306 * Re**(-0.117) * chord
-    St1 = 0.02 * M**(-0.6)
-    K1 = get_K1(Re)
-    # Frequency range
-    f = np.logspace(1, 4, 100)  # 10 Hz to 10 kHz
-    St = f * delta_star / U
-    a = np.abs(np.log10(St / St1))
-    A = np.vectorize(get_A)(a)
-    # SPL spectrum (simplified for zero alpha)
-    SPL = 10 * np.log10(delta_star * M**5 * L * D_H / R**2) + A + K1
-    # Overall SPL
-    overall_SPL = 10 * np.log10(np.sum(10**(SPL / 10)))
-    return f, SPL, overall_SPL
+    SPL = _estimate_spl_core(float(tip_speed), float(chord), float(wind_speed), F, C0, NU, R, L, D_H)
+    # Overall SPL: 10*log10(sum(10^(SPL/10))) as a max-shifted logsumexp in natural-log units (no 10**x overflow)
+    overall_SPL = logsumexp(SPL * LN10 / 10) * 10 / LN10
+    return F, SPL, overall_SPL
 
 # Example usage to compare different blade designs
 if __name__ == "__main__":